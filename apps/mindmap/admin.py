@@ -17,6 +17,7 @@ class MindmapNodeAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
     readonly_fields = ['created_at', 'updated_at']
     raw_id_fields = ['creator', 'assignee', 'project']
+    list_select_related = ['creator', 'assignee']
 
 
 @admin.register(MindmapConnection)
@@ -25,4 +26,5 @@ class MindmapConnectionAdmin(admin.ModelAdmin):
     list_filter = ['connection_type', 'created_at']
     search_fields = ['from_node__title', 'to_node__title', 'label']
     readonly_fields = ['created_at']
-    raw_id_fields = ['from_node', 'to_node']
+    raw_id_fields = ['from_node', 'to_node', 'project']
+    list_select_related = ['from_node', 'to_node']
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0001_initial'),
+        ('webapp', '0002_alter_botuser_telegram_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mindmapnode',
+            index=models.Index(fields=['project', '-created_at'], name='mindmap_min_project_ec88de_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_connection_project(apps, schema_editor):
+    MindmapConnection = apps.get_model('mindmap', 'MindmapConnection')
+    MindmapNode = apps.get_model('mindmap', 'MindmapNode')
+    MindmapConnection.objects.update(
+        project_id=Subquery(
+            MindmapNode.objects.filter(id=OuterRef('from_node_id')).values('project_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0002_mindmapnode_project_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mindmapconnection',
+            name='project',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='connections', to='mindmap.mindmapproject'),
+        ),
+        migrations.RunPython(populate_connection_project, migrations.RunPython.noop),
+    ]
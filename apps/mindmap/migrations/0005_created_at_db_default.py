@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:39
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0003_mindmapconnection_project'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mindmapconnection',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='mindmapnode',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+    ]
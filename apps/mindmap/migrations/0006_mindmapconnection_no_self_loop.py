@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:39
+
+from django.db import migrations, models
+
+
+def delete_self_loops(apps, schema_editor):
+    MindmapConnection = apps.get_model('mindmap', 'MindmapConnection')
+    MindmapConnection.objects.filter(from_node=models.F('to_node')).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0005_created_at_db_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_self_loops, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='mindmapconnection',
+            constraint=models.CheckConstraint(condition=models.Q(('from_node', models.F('to_node')), _negated=True), name='mindmap_connection_no_self_loop'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+def mark_main_nodes(apps, schema_editor):
+    MindmapNode = apps.get_model('mindmap', 'MindmapNode')
+    # Match in Python: JSON containment lookups aren't available on every backend
+    main_ids = [
+        node_id for node_id, tags in MindmapNode.objects.values_list('id', 'tags')
+        if isinstance(tags, list) and 'project' in tags and 'main' in tags
+    ]
+    MindmapNode.objects.filter(id__in=main_ids).update(is_main=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0006_mindmapconnection_no_self_loop'),
+        ('webapp', '0002_alter_botuser_telegram_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mindmapnode',
+            name='is_main',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_main_nodes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='mindmapnode',
+            index=models.Index(condition=models.Q(('is_main', True)), fields=['project'], name='mindmap_node_main_idx'),
+        ),
+    ]
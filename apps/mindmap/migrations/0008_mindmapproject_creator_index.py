@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mindmap', '0007_mindmapnode_is_main'),
+        ('webapp', '0002_alter_botuser_telegram_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mindmapproject',
+            index=models.Index(fields=['creator', '-created_at'], name='mindmap_min_creator_3e2e56_idx'),
+        ),
+    ]
@@ -1,8 +1,42 @@
-from django.db import models
+import time
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Now
 from django.contrib.auth.models import User
 from apps.webapp.models import BotUser
 
 
+def _project_cache_version_key(project_id):
+    return f'mm:proj:{project_id}:ver'
+
+
+def get_project_cache_version(project_id):
+    """Get the current version of a project's cached mindmap data"""
+    key = _project_cache_version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _incr_project_cache_version(project_id):
+    try:
+        cache.incr(_project_cache_version_key(project_id))
+    except ValueError:
+        cache.add(_project_cache_version_key(project_id), time.time_ns(), None)
+
+
+def bump_project_cache_version(project_id):
+    """Invalidate a project's cached mindmap data once the current transaction commits"""
+    if not project_id:
+        return
+    # Bumping before commit would let a concurrent read cache the old rows under the new version
+    transaction.on_commit(lambda: _incr_project_cache_version(project_id))
+
+
 class MindmapNode(models.Model):
     STATUS_CHOICES = [
         ('todo', 'To Do'),
@@ -39,36 +73,58 @@ class MindmapNode(models.Model):
     
     # Tags for categorization
     tags = models.JSONField(default=list, blank=True)
+    # Marks the project's main node (also tagged 'project' and 'main')
+    is_main = models.BooleanField(default=False)
     
     # Metadata
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Mindmap Node'
         verbose_name_plural = 'Mindmap Nodes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', '-created_at']),
+            models.Index(fields=['project'], condition=models.Q(is_main=True), name='mindmap_node_main_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.title} ({self.get_status_display()})"
+        return f"{self.title} ({_STATUS_DISPLAY.get(self.status, self.status)})"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_project_cache_version(self.project_id)
+    
+    def delete(self, *args, **kwargs):
+        project_id = self.project_id
+        result = super().delete(*args, **kwargs)
+        bump_project_cache_version(project_id)
+        return result
     
     def get_children(self):
         """Get all child nodes connected to this node"""
         return MindmapNode.objects.filter(
-            id__in=self.outgoing_connections.values_list('to_node_id', flat=True)
-        )
+            incoming_connections__from_node_id=self.id
+        ).select_related('creator', 'assignee', 'project')
     
     def get_parents(self):
         """Get all parent nodes that connect to this node"""
         return MindmapNode.objects.filter(
-            id__in=self.incoming_connections.values_list('from_node_id', flat=True)
-        )
+            outgoing_connections__to_node_id=self.id
+        ).select_related('creator', 'assignee', 'project')
+
+
+# Label lookup for __str__, built once instead of per get_status_display() call
+_STATUS_DISPLAY = dict(MindmapNode.STATUS_CHOICES)
 
 
 class MindmapConnection(models.Model):
     """Represents connections between mindmap nodes"""
     from_node = models.ForeignKey(MindmapNode, on_delete=models.CASCADE, related_name='outgoing_connections')
     to_node = models.ForeignKey(MindmapNode, on_delete=models.CASCADE, related_name='incoming_connections')
+    # Denormalized from from_node so project lookups don't need to join through nodes
+    project = models.ForeignKey('MindmapProject', on_delete=models.CASCADE, related_name='connections', null=True, blank=True)
     
     # Connection metadata
     connection_type = models.CharField(max_length=50, default='dependency', blank=True)
@@ -78,15 +134,33 @@ class MindmapConnection(models.Model):
     color = models.CharField(max_length=7, default='#3b82f6', help_text='Hex color code')
     thickness = models.IntegerField(default=2)
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     
     class Meta:
         verbose_name = 'Mindmap Connection'
         verbose_name_plural = 'Mindmap Connections'
         unique_together = ['from_node', 'to_node']
+        constraints = [
+            models.CheckConstraint(
+                condition=~models.Q(from_node=models.F('to_node')),
+                name='mindmap_connection_no_self_loop',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.from_node.title} → {self.to_node.title}"
+    
+    def save(self, *args, **kwargs):
+        # Both endpoints live in the same project, so it's taken from from_node
+        self.project_id = self.from_node.project_id
+        super().save(*args, **kwargs)
+        bump_project_cache_version(self.project_id)
+    
+    def delete(self, *args, **kwargs):
+        project_id = self.project_id
+        result = super().delete(*args, **kwargs)
+        bump_project_cache_version(project_id)
+        return result
 
 
 class MindmapProject(models.Model):
@@ -107,17 +181,17 @@ class MindmapProject(models.Model):
         verbose_name = 'Mindmap Project'
         verbose_name_plural = 'Mindmap Projects'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['creator', '-created_at']),
+        ]
     
     def __str__(self):
         return self.name
     
     def get_nodes(self):
         """Get all nodes in this project"""
-        return MindmapNode.objects.filter(project=self)
+        return MindmapNode.objects.filter(project=self).select_related('creator', 'assignee', 'project')
     
     def get_connections(self):
         """Get all connections in this project"""
-        node_ids = self.get_nodes().values_list('id', flat=True)
-        return MindmapConnection.objects.filter(
-            models.Q(from_node_id__in=node_ids) | models.Q(to_node_id__in=node_ids)
-        )
+        return self.connections.select_related('from_node', 'to_node')
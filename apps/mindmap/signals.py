@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.webapp.models import BotUser
+from .models import MindmapNode, bump_project_cache_version
+
+
+def _bump_assigned_projects(bot_user):
+    """Invalidate every project payload that embeds this user as an assignee"""
+    project_ids = MindmapNode.objects.filter(
+        assignee_id=bot_user.pk
+    ).values_list('project_id', flat=True).distinct()
+    for project_id in project_ids:
+        bump_project_cache_version(project_id)
+
+
+@receiver(post_save, sender=BotUser)
+def bot_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # A new user has no assigned nodes, and saves that skip the name can't change the payload
+    if created or (update_fields is not None and 'full_name' not in update_fields):
+        return
+    _bump_assigned_projects(instance)
+
+
+@receiver(pre_delete, sender=BotUser)
+def bot_user_deleted(sender, instance, **kwargs):
+    # Collect projects before the delete nulls assignee_id on their nodes
+    _bump_assigned_projects(instance)
@@ -1,3 +1,212 @@
+import orjson
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from apps.webapp.models import BotUser
+from .models import MindmapConnection, MindmapNode, MindmapProject, get_project_cache_version
+
+
+class MindmapTestCase(TestCase):
+    def setUp(self):
+        # The cache isn't rolled back with the test transaction, and ids are reused
+        cache.clear()
+        self.owner = BotUser.objects.create(
+            user=User.objects.create_user('alice'), telegram_id=1, first_name='Alice'
+        )
+        self.other = BotUser.objects.create(
+            user=User.objects.create_user('bob'), telegram_id=2, first_name='Bob', last_name='Ray'
+        )
+        self.project = MindmapProject.objects.create(name='P1', creator=self.owner)
+        self.other_project = MindmapProject.objects.create(name='P2', creator=self.other)
+        self.client.force_login(self.owner.user)
+
+    def make_node(self, project=None, creator=None, **kwargs):
+        return MindmapNode.objects.create(
+            project=project or self.project, creator=creator or self.owner, **kwargs
+        )
+
+    def post(self, name, payload):
+        response = self.client.post(
+            reverse(f'mindmap:{name}'), data=orjson.dumps(payload), content_type='application/json'
+        )
+        return response, orjson.loads(response.content)
+
+
+class BulkCreateNodesTests(MindmapTestCase):
+    def test_creates_nodes_in_order(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response, data = self.post('bulk_create_nodes', {
+                'project_id': self.project.id,
+                'nodes': [{'title': 'A', 'assignee_id': str(self.other.id)}, {'title': 'B', 'x': 3}],
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([node['title'] for node in data['nodes']], ['A', 'B'])
+        self.assertEqual(data['nodes'][0]['assignee']['name'], 'Bob Ray')
+        self.assertIsNone(data['nodes'][1]['assignee'])
+        self.assertEqual(data['nodes'][1]['x'], 3)
+        self.assertEqual(self.project.nodes.count(), 2)
+
+    def test_rejects_foreign_project(self):
+        response, data = self.post('bulk_create_nodes', {
+            'project_id': self.other_project.id, 'nodes': [{'title': 'A'}],
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(MindmapNode.objects.exists())
+
+    def test_invalidates_cached_payload(self):
+        self.client.get(reverse('mindmap:get_mindmap_data'), {'project_id': self.project.id})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post('bulk_create_nodes', {'project_id': self.project.id, 'nodes': [{'title': 'A'}]})
+        response = self.client.get(reverse('mindmap:get_mindmap_data'), {'project_id': self.project.id})
+        self.assertEqual([node['title'] for node in orjson.loads(response.content)['nodes']], ['A'])
+
+
+class BulkUpdateNodePositionsTests(MindmapTestCase):
+    def test_moves_own_nodes_and_stamps_updated_at(self):
+        node = self.make_node(title='A')
+        before = node.updated_at
+        response, data = self.post('bulk_update_node_positions', {
+            'nodes': [{'id': str(node.id), 'x': 11, 'y': 12}],
+        })
+        self.assertEqual(data, {'success': True, 'updated': 1})
+        node.refresh_from_db()
+        self.assertEqual((node.x_position, node.y_position), (11, 12))
+        self.assertGreater(node.updated_at, before)
+
+    def test_skips_nodes_of_other_users(self):
+        node = self.make_node(project=self.other_project, creator=self.other, title='B')
+        response, data = self.post('bulk_update_node_positions', {'nodes': [{'id': node.id, 'x': 11}]})
+        self.assertEqual(data['updated'], 0)
+        node.refresh_from_db()
+        self.assertEqual(node.x_position, 0)
+
+    def test_requires_positions(self):
+        response, data = self.post('bulk_update_node_positions', {'nodes': []})
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkCreateConnectionsTests(MindmapTestCase):
+    def test_creates_connections(self):
+        a, b = self.make_node(title='A'), self.make_node(title='B')
+        response, data = self.post('bulk_create_connections', {
+            'connections': [{'from_node_id': str(a.id), 'to_node_id': b.id}],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['connections'][0]['from_node_id'], a.id)
+        self.assertEqual(MindmapConnection.objects.get().project_id, self.project.id)
+
+    def test_rejects_self_loop(self):
+        a = self.make_node(title='A')
+        response, data = self.post('bulk_create_connections', {
+            'connections': [{'from_node_id': a.id, 'to_node_id': str(a.id)}],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MindmapConnection.objects.exists())
+
+    def test_rejects_foreign_node(self):
+        a = self.make_node(title='A')
+        b = self.make_node(project=self.other_project, creator=self.other, title='B')
+        response, data = self.post('bulk_create_connections', {
+            'connections': [{'from_node_id': a.id, 'to_node_id': b.id}],
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(MindmapConnection.objects.exists())
+
+    def test_rejects_nodes_from_different_projects(self):
+        second = MindmapProject.objects.create(name='P3', creator=self.owner)
+        a, b = self.make_node(title='A'), self.make_node(project=second, title='B')
+        response, data = self.post('bulk_create_connections', {
+            'connections': [{'from_node_id': a.id, 'to_node_id': b.id}],
+        })
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(MindmapConnection.objects.exists())
+
+
+class AssigneeInvalidationTests(MindmapTestCase):
+    def test_telegram_login_keeps_assigned_projects_cached(self):
+        self.make_node(title='A', assignee=self.other)
+        version = get_project_cache_version(self.project.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('webapp:auth'),
+                data=orjson.dumps({'telegram_user': {'id': self.other.telegram_id}}),
+                content_type='application/json',
+            )
+        self.assertTrue(orjson.loads(response.content)['success'])
+        self.assertEqual(get_project_cache_version(self.project.id), version)
+
+
+class UpdateProjectTests(MindmapTestCase):
+    def test_rename_updates_main_node(self):
+        main = self.make_node(title='P1', is_main=True)
+        before = main.updated_at
+        response, data = self.post('update_project', {'id': self.project.id, 'name': 'P1b'})
+        self.assertTrue(data['success'])
+        main.refresh_from_db()
+        self.assertEqual(main.title, 'P1b')
+        self.assertGreater(main.updated_at, before)
+
+
+class PayloadCacheTests(MindmapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a = self.make_node(title='A', assignee=self.other)
+        self.b = self.make_node(title='B')
+        self.connection = MindmapConnection.objects.create(from_node=self.a, to_node=self.b)
+
+    def get_data(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('mindmap:get_mindmap_data'), {'project_id': self.project.id}, **headers)
+
+    def assertRefreshed(self, etag):
+        """Return the payload served for a stale ETag, which must be a full 200 with a new ETag"""
+        response = self.get_data(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return orjson.loads(response.content)
+
+    def test_unchanged_project_returns_304(self):
+        response = self.get_data()
+        self.assertEqual(response.status_code, 200)
+        response = self.get_data(response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_update_node_refreshes_payload(self):
+        etag = self.get_data()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post('update_node', {'id': self.a.id, 'title': 'A2'})
+        titles = {node['title'] for node in self.assertRefreshed(etag)['nodes']}
+        self.assertEqual(titles, {'A2', 'B'})
+
+    def test_delete_connection_refreshes_payload(self):
+        etag = self.get_data()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post('delete_connection', {'id': self.connection.id})
+        data = self.assertRefreshed(etag)
+        self.assertEqual(data['connections'], [])
+        self.assertTrue(all(node['children'] == [] for node in data['nodes']))
+
+    def test_update_project_rename_refreshes_payload(self):
+        self.make_node(title='P1', is_main=True)
+        etag = self.get_data()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post('update_project', {'id': self.project.id, 'name': 'P1b'})
+        titles = {node['title'] for node in self.assertRefreshed(etag)['nodes']}
+        self.assertEqual(titles, {'A', 'B', 'P1b'})
+
+    def test_assignee_rename_refreshes_payload(self):
+        etag = self.get_data()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.first_name = 'Robert'
+            self.other.save(update_fields=['first_name'])
+        names = [node['assignee']['name'] for node in self.assertRefreshed(etag)['nodes'] if node['assignee']]
+        self.assertEqual(names, ['Robert Ray'])
+
+    def test_assignee_delete_refreshes_payload(self):
+        etag = self.get_data()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.delete()
+        self.assertTrue(all(node['assignee'] is None for node in self.assertRefreshed(etag)['nodes']))
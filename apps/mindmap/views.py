@@ -1,28 +1,71 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
-import json
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+import orjson
 
-from .models import MindmapNode, MindmapConnection, MindmapProject
+from .models import (
+    MindmapNode, MindmapConnection, MindmapProject,
+    get_project_cache_version, bump_project_cache_version,
+)
 from apps.webapp.models import BotUser
 
 
+# Placeholder avatar shown for node assignees
+DEFAULT_AVATAR_URL = 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80'
+
+# Request keys accepted by update_node and the model fields they set
+NODE_FIELD_MAP = {
+    'title': 'title',
+    'description': 'description',
+    'status': 'status',
+    'priority': 'priority',
+    'x': 'x_position',
+    'y': 'y_position',
+    'width': 'width',
+    'height': 'height',
+    'tags': 'tags',
+}
+
+
+def fast_json_response(data, status=200):
+    """Build a JSON response serialized with orjson"""
+    return HttpResponse(orjson.dumps(data), status=status, content_type='application/json')
+
+
+def _serialize_node(node):
+    """Serialize a node for create/update responses"""
+    return {
+        'id': node.id,
+        'title': node.title,
+        'description': node.description,
+        'status': node.status,
+        'priority': node.priority,
+        'x': node.x_position,
+        'y': node.y_position,
+        'width': node.width,
+        'height': node.height,
+        'tags': node.tags,
+        'assignee': {
+            'id': node.assignee.id,
+            'name': node.assignee.full_name,
+            'avatar': DEFAULT_AVATAR_URL
+        } if node.assignee else None,
+    }
+
+
 @login_required
 def mindmap_view(request):
     """Main mindmap view"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     # Get all projects for the user
     projects = MindmapProject.objects.filter(creator=bot_user).order_by('-created_at')
@@ -42,14 +85,24 @@ def mindmap_view(request):
             request.session.pop('last_selected_project_id', None)
     
     # If no current project, use the first available project
-    if not current_project and projects.exists():
+    if not current_project:
         current_project = projects.first()
+    
+    # Only touch the session when the value changes, so it isn't re-saved on every page load
+    if current_project and last_project_id != current_project.id:
         request.session['last_selected_project_id'] = current_project.id
     
+    # Embed the current project's payload so the page renders without a follow-up AJAX call
+    if current_project:
+        mindmap_data = _get_cached_mindmap_data(current_project)
+    else:
+        mindmap_data = {'nodes': [], 'connections': []}
+    
     context = {
         'projects': projects,
         'users': users,
         'current_project': current_project,
+        'mindmap_data': mindmap_data,
     }
     
     return render(request, 'mindmap/mindmap.html', context)
@@ -60,29 +113,25 @@ def mindmap_view(request):
 @login_required
 def create_node(request):
     """Create a new mindmap node via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         
         # Get project ID from request data
         project_id = data.get('project_id')
         if not project_id:
-            return JsonResponse({'success': False, 'error': 'Project ID required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Project ID required'}, status=400)
         
         try:
             project = MindmapProject.objects.get(id=project_id, creator=bot_user)
         except MindmapProject.DoesNotExist:
-            return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
+            return fast_json_response({'success': False, 'error': 'Project not found'}, status=404)
+        
+        # Resolve the assignee up front so the node is written in a single INSERT
+        assignee = None
+        if data.get('assignee_id'):
+            assignee = BotUser.objects.filter(id=data['assignee_id']).first()
         
         # Create the node
         node = MindmapNode.objects.create(
@@ -95,42 +144,20 @@ def create_node(request):
             width=data.get('width', 200),
             height=data.get('height', 80),
             tags=data.get('tags', []),
+            assignee=assignee,
             creator=bot_user,
             project=project,
         )
         
-        # Set assignee if provided
-        if data.get('assignee_id'):
-            try:
-                assignee = BotUser.objects.get(id=data['assignee_id'])
-                node.assignee = assignee
-                node.save()
-            except BotUser.DoesNotExist:
-                pass
-        
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
-            'node': {
-                'id': node.id,
-                'title': node.title,
-                'description': node.description,
-                'status': node.status,
-                'priority': node.priority,
-                'x': node.x_position,
-                'y': node.y_position,
-                'width': node.width,
-                'height': node.height,
-                'tags': node.tags,
-                'assignee': {
-                    'id': node.assignee.id,
-                    'name': node.assignee.get_full_name(),
-                    'avatar': 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80'
-                } if node.assignee else None,
-            }
+            'node': _serialize_node(node),
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -138,55 +165,26 @@ def create_node(request):
 @login_required
 def update_node(request):
     """Update an existing mindmap node via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         node_id = data.get('id')
         
         if not node_id:
-            return JsonResponse({'success': False, 'error': 'Node ID required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Node ID required'}, status=400)
         
-        node = get_object_or_404(MindmapNode, id=node_id)
+        # Ownership is part of the lookup, so a foreign node is simply not found
+        node = MindmapNode.objects.filter(id=node_id, creator=bot_user).first()
+        if node is None:
+            return fast_json_response({'success': False, 'error': 'Not found or permission denied'}, status=404)
         
-        # Check if user has permission to edit this node
-        if node.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-        
-        # Update node fields
-        if 'title' in data:
-            node.title = data['title']
-        if 'description' in data:
-            node.description = data['description']
-        if 'status' in data:
-            node.status = data['status']
-        if 'priority' in data:
-            node.priority = data['priority']
-        if 'x' in data:
-            node.x_position = data['x']
-        if 'y' in data:
-            node.y_position = data['y']
-        if 'width' in data:
-            node.width = data['width']
-        if 'height' in data:
-            node.height = data['height']
-        if 'tags' in data:
-            node.tags = data['tags']
-        
-        # If this is a main project node and title changed, update project name
-        if 'title' in data and node.tags and 'project' in node.tags and 'main' in node.tags:
-            if node.project and node.project.name != data['title']:
-                node.project.name = data['title']
-                node.project.save()
+        # Update node fields, tracking which columns need writing
+        changed_fields = ['updated_at']
+        for key, field in NODE_FIELD_MAP.items():
+            if key in data:
+                setattr(node, field, data[key])
+                changed_fields.append(field)
         
         # Update assignee
         if 'assignee_id' in data:
@@ -198,32 +196,127 @@ def update_node(request):
                     node.assignee = None
             else:
                 node.assignee = None
+            changed_fields.append('assignee')
+        
+        # Commit the project rename and the node update together
+        with transaction.atomic():
+            # If this is a main project node and title changed, update project name
+            if 'title' in data and node.is_main:
+                if node.project and node.project.name != data['title']:
+                    node.project.name = data['title']
+                    node.project.save(update_fields=['name', 'updated_at'])
+            
+            node.save(update_fields=changed_fields)
+        
+        return fast_json_response({
+            'success': True,
+            'node': _serialize_node(node),
+        })
+        
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+@login_required
+def bulk_create_nodes(request):
+    """Create many mindmap nodes in one request via AJAX"""
+    bot_user = request.bot_user
+    
+    try:
+        data = orjson.loads(request.body)
+        
+        project_id = data.get('project_id')
+        if not project_id:
+            return fast_json_response({'success': False, 'error': 'Project ID required'}, status=400)
+        
+        try:
+            project = MindmapProject.objects.get(id=project_id, creator=bot_user)
+        except MindmapProject.DoesNotExist:
+            return fast_json_response({'success': False, 'error': 'Project not found'}, status=404)
+        
+        items = data.get('nodes', [])
+        
+        # Resolve all requested assignees with a single query
+        assignees = BotUser.objects.in_bulk(
+            {int(item['assignee_id']) for item in items if item.get('assignee_id')}
+        )
+        
+        nodes = [
+            MindmapNode(
+                title=item.get('title', 'New Node'),
+                description=item.get('description', ''),
+                status=item.get('status', 'todo'),
+                priority=item.get('priority', 'med'),
+                x_position=item.get('x', 0),
+                y_position=item.get('y', 0),
+                width=item.get('width', 200),
+                height=item.get('height', 80),
+                tags=item.get('tags', []),
+                assignee=assignees.get(int(item['assignee_id'])) if item.get('assignee_id') else None,
+                creator=bot_user,
+                project=project,
+            )
+            for item in items
+        ]
+        nodes = MindmapNode.objects.bulk_create(nodes, batch_size=500)
         
-        node.save()
+        # bulk_create skips save(), so invalidate the cached project data here
+        bump_project_cache_version(project.id)
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
-            'node': {
-                'id': node.id,
-                'title': node.title,
-                'description': node.description,
-                'status': node.status,
-                'priority': node.priority,
-                'x': node.x_position,
-                'y': node.y_position,
-                'width': node.width,
-                'height': node.height,
-                'tags': node.tags,
-                'assignee': {
-                    'id': node.assignee.id,
-                    'name': node.assignee.get_full_name(),
-                    'avatar': 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80'
-                } if node.assignee else None,
-            }
+            'nodes': [_serialize_node(node) for node in nodes],
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+@login_required
+def bulk_update_node_positions(request):
+    """Move many mindmap nodes in one request via AJAX"""
+    bot_user = request.bot_user
+    
+    try:
+        data = orjson.loads(request.body)
+        positions = {str(item['id']): item for item in data.get('nodes', [])}
+        
+        if not positions:
+            return fast_json_response({'success': False, 'error': 'Node positions required'}, status=400)
+        
+        # Only the user's own nodes can be moved, same as update_node
+        nodes = list(MindmapNode.objects.filter(
+            id__in=positions.keys(),
+            creator=bot_user
+        ).only('id', 'x_position', 'y_position', 'updated_at', 'project_id'))
+        
+        # bulk_update skips auto_now, so stamp updated_at explicitly like update_node's save does
+        now = timezone.now()
+        for node in nodes:
+            item = positions[str(node.id)]
+            node.x_position = item.get('x', node.x_position)
+            node.y_position = item.get('y', node.y_position)
+            node.updated_at = now
+        
+        MindmapNode.objects.bulk_update(nodes, fields=['x_position', 'y_position', 'updated_at'], batch_size=500)
+        
+        for project_id in {node.project_id for node in nodes}:
+            bump_project_cache_version(project_id)
+        
+        return fast_json_response({'success': True, 'updated': len(nodes)})
+        
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -231,36 +324,28 @@ def update_node(request):
 @login_required
 def delete_node(request):
     """Delete a mindmap node via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         node_id = data.get('id')
         
         if not node_id:
-            return JsonResponse({'success': False, 'error': 'Node ID required'}, status=400)
-        
-        node = get_object_or_404(MindmapNode, id=node_id)
+            return fast_json_response({'success': False, 'error': 'Node ID required'}, status=400)
         
-        # Check if user has permission to delete this node
-        if node.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        # Only project_id is needed to invalidate the cached project payload
+        node = MindmapNode.objects.filter(id=node_id, creator=bot_user).only('id', 'project_id').first()
+        if node is None:
+            return fast_json_response({'success': False, 'error': 'Not found or permission denied'}, status=404)
         
         node.delete()
         
-        return JsonResponse({'success': True})
+        return fast_json_response({'success': True})
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -268,34 +353,32 @@ def delete_node(request):
 @login_required
 def create_connection(request):
     """Create a connection between nodes via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         from_node_id = data.get('from_node_id')
         to_node_id = data.get('to_node_id')
         
         if not from_node_id or not to_node_id:
-            return JsonResponse({'success': False, 'error': 'Both node IDs required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Both node IDs required'}, status=400)
         
-        from_node = get_object_or_404(MindmapNode, id=from_node_id)
-        to_node = get_object_or_404(MindmapNode, id=to_node_id)
+        if str(from_node_id) == str(to_node_id):
+            return fast_json_response({'success': False, 'error': 'Cannot connect a node to itself'}, status=400)
         
-        # Check if user has permission to create connections for these nodes
-        # Allow connections if both nodes belong to the same project and user owns that project
-        if (from_node.project != to_node.project or 
-            not from_node.project or 
-            from_node.project.creator != bot_user):
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        # Fetch both endpoints in one query, limited to projects the user owns
+        nodes = MindmapNode.objects.filter(
+            project__creator=bot_user
+        ).only('id', 'project_id').in_bulk([int(from_node_id), int(to_node_id)])
+        from_node = nodes.get(int(from_node_id))
+        to_node = nodes.get(int(to_node_id))
+        
+        if not from_node or not to_node:
+            return fast_json_response({'success': False, 'error': 'Not found or permission denied'}, status=404)
+        
+        # Allow connections only between nodes of the same project
+        if from_node.project_id != to_node.project_id:
+            return fast_json_response({'success': False, 'error': 'Permission denied'}, status=403)
         
         # Create the connection
         connection = MindmapConnection.objects.create(
@@ -307,7 +390,7 @@ def create_connection(request):
             thickness=data.get('thickness', 2),
         )
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'connection': {
                 'id': connection.id,
@@ -320,8 +403,81 @@ def create_connection(request):
             }
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+@login_required
+def bulk_create_connections(request):
+    """Create many connections between nodes in one request via AJAX"""
+    bot_user = request.bot_user
+    
+    try:
+        data = orjson.loads(request.body)
+        items = data.get('connections', [])
+        
+        if any(not item.get('from_node_id') or not item.get('to_node_id') for item in items):
+            return fast_json_response({'success': False, 'error': 'Both node IDs required'}, status=400)
+        
+        if any(str(item['from_node_id']) == str(item['to_node_id']) for item in items):
+            return fast_json_response({'success': False, 'error': 'Cannot connect a node to itself'}, status=400)
+        
+        # Fetch every endpoint in one query, limited to projects the user owns
+        node_ids = {int(item['from_node_id']) for item in items} | {int(item['to_node_id']) for item in items}
+        nodes = MindmapNode.objects.filter(
+            project__creator=bot_user
+        ).only('id', 'project_id').in_bulk(node_ids)
+        
+        connections = []
+        for item in items:
+            from_node = nodes.get(int(item['from_node_id']))
+            to_node = nodes.get(int(item['to_node_id']))
+            
+            # Same rules as create_connection: both nodes owned by the user, in one project
+            if not from_node or not to_node:
+                return fast_json_response({'success': False, 'error': 'Not found or permission denied'}, status=404)
+            if from_node.project_id != to_node.project_id:
+                return fast_json_response({'success': False, 'error': 'Permission denied'}, status=403)
+            
+            connections.append(MindmapConnection(
+                from_node=from_node,
+                to_node=to_node,
+                project_id=from_node.project_id,
+                connection_type=item.get('connection_type', 'dependency'),
+                label=item.get('label', ''),
+                color=item.get('color', '#3b82f6'),
+                thickness=item.get('thickness', 2),
+            ))
+        
+        connections = MindmapConnection.objects.bulk_create(connections, batch_size=500)
+        
+        for project_id in {connection.project_id for connection in connections}:
+            bump_project_cache_version(project_id)
+        
+        return fast_json_response({
+            'success': True,
+            'connections': [
+                {
+                    'id': connection.id,
+                    'from_node_id': connection.from_node_id,
+                    'to_node_id': connection.to_node_id,
+                    'connection_type': connection.connection_type,
+                    'label': connection.label,
+                    'color': connection.color,
+                    'thickness': connection.thickness,
+                }
+                for connection in connections
+            ],
+        })
+        
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -329,58 +485,122 @@ def create_connection(request):
 @login_required
 def delete_connection(request):
     """Delete a connection between nodes via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         connection_id = data.get('id')
         
         if not connection_id:
-            return JsonResponse({'success': False, 'error': 'Connection ID required'}, status=400)
-        
-        connection = get_object_or_404(MindmapConnection, id=connection_id)
+            return fast_json_response({'success': False, 'error': 'Connection ID required'}, status=400)
         
-        # Check if user has permission to delete this connection
-        if connection.from_node.creator != bot_user or connection.to_node.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        # Check ownership of both endpoints in the same query instead of loading each node
+        connection = MindmapConnection.objects.filter(
+            id=connection_id, from_node__creator=bot_user, to_node__creator=bot_user
+        ).only('id', 'project_id').first()
+        if connection is None:
+            return fast_json_response({'success': False, 'error': 'Not found or permission denied'}, status=404)
         
         connection.delete()
         
-        return JsonResponse({'success': True})
+        return fast_json_response({'success': True})
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
+
+
+def _build_mindmap_data(project):
+    """Serialize all nodes and connections of a project"""
+    # Read plain tuples straight from the cursor instead of building model instances
+    nodes = MindmapNode.objects.filter(project=project).order_by('-created_at', '-id').values_list(
+        'id', 'title', 'description', 'status', 'priority',
+        'x_position', 'y_position', 'width', 'height', 'tags',
+        'assignee_id', 'assignee__full_name',
+    )
+    nodes_data = [
+        {
+            'id': str(node_id),
+            'title': title,
+            'description': description,
+            'status': status,
+            'priority': priority,
+            'x': x,
+            'y': y,
+            'width': width,
+            'height': height,
+            'tags': tags,
+            'assignee': {
+                'id': str(assignee_id),
+                'name': assignee_name,
+                'avatar': DEFAULT_AVATAR_URL
+            } if assignee_id else None,
+            'children': [],  # Will be populated based on connections
+        }
+        for (node_id, title, description, status, priority, x, y, width, height, tags,
+             assignee_id, assignee_name) in nodes
+    ]
+    
+    node_index = {node_data['id']: node_data for node_data in nodes_data}
+    
+    connections = MindmapConnection.objects.filter(project=project).values_list(
+        'id', 'from_node_id', 'to_node_id', 'connection_type', 'label', 'color', 'thickness',
+    )
+    
+    connections_data = []
+    for connection_id, from_node_id, to_node_id, connection_type, label, color, thickness in connections:
+        from_node_id, to_node_id = str(from_node_id), str(to_node_id)
+        connections_data.append({
+            'id': connection_id,
+            'from_node_id': from_node_id,
+            'to_node_id': to_node_id,
+            'connection_type': connection_type,
+            'label': label,
+            'color': color,
+            'thickness': thickness,
+        })
+        
+        # Update children arrays
+        parent = node_index.get(from_node_id)
+        if parent:
+            parent['children'].append(to_node_id)
+    
+    return {
+        'nodes': nodes_data,
+        'connections': connections_data,
+    }
+
+
+def _get_cached_mindmap_data(project, version=None):
+    """Serve a project's serialized data from cache until a node or connection changes"""
+    if version is None:
+        version = get_project_cache_version(project.id)
+    cache_key = f'mm:proj:{project.id}:v{version}:data'
+    return cache.get_or_set(cache_key, lambda: _build_mindmap_data(project), 300)
+
+
+def _get_cached_mindmap_response(project, version):
+    """Serve get_mindmap_data's encoded body from cache so hits skip JSON encoding too"""
+    cache_key = f'mm:proj:{project.id}:v{version}:json'
+    return cache.get_or_set(
+        cache_key,
+        lambda: orjson.dumps({'success': True, **_get_cached_mindmap_data(project, version)}),
+        300,
+    )
 
 
 @require_http_methods(["GET"])
 @login_required
 def get_mindmap_data(request):
     """Get all mindmap data for the current user via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
         # Get project ID from request parameters
         project_id = request.GET.get('project_id')
         if not project_id:
-            return JsonResponse({
+            return fast_json_response({
                 'success': True,
                 'nodes': [],
                 'connections': [],
@@ -390,101 +610,53 @@ def get_mindmap_data(request):
         try:
             project = MindmapProject.objects.get(id=project_id, creator=bot_user)
         except MindmapProject.DoesNotExist:
-            return JsonResponse({'success': False, 'error': 'Project not found'}, status=404)
-        
-        # Get all nodes
-        nodes = MindmapNode.objects.filter(project=project).order_by('-created_at')
-        nodes_data = []
-        
-        for node in nodes:
-            nodes_data.append({
-                'id': str(node.id),
-                'title': node.title,
-                'description': node.description,
-                'status': node.status,
-                'priority': node.priority,
-                'x': node.x_position,
-                'y': node.y_position,
-                'width': node.width,
-                'height': node.height,
-                'tags': node.tags,
-                'assignee': {
-                    'id': str(node.assignee.id),
-                    'name': node.assignee.get_full_name(),
-                    'avatar': 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80'
-                } if node.assignee else None,
-                'children': [],  # Will be populated based on connections
-            })
-        
-        # Get all connections
-        connections = MindmapConnection.objects.filter(
-            from_node__project=project
-        ).select_related('from_node', 'to_node')
-        
-        connections_data = []
-        for connection in connections:
-            connections_data.append({
-                'id': connection.id,
-                'from_node_id': str(connection.from_node.id),
-                'to_node_id': str(connection.to_node.id),
-                'connection_type': connection.connection_type,
-                'label': connection.label,
-                'color': connection.color,
-                'thickness': connection.thickness,
-            })
-            
-            # Update children arrays
-            for node_data in nodes_data:
-                if node_data['id'] == str(connection.from_node.id):
-                    node_data['children'].append(str(connection.to_node.id))
-        
-        return JsonResponse({
-            'success': True,
-            'nodes': nodes_data,
-            'connections': connections_data,
-        })
+            return fast_json_response({'success': False, 'error': 'Project not found'}, status=404)
+        
+        # The cache version changes on every write, so it doubles as the ETag; read it
+        # once so the body and the ETag always describe the same version
+        version = get_project_cache_version(project.id)
+        etag = f'"{project.id}-{version}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(_get_cached_mindmap_response(project, version), content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
         
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
 @login_required
 def get_projects(request):
     """Get all projects for the current user via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        projects = MindmapProject.objects.filter(creator=bot_user).order_by('-created_at')
+        projects = MindmapProject.objects.filter(creator=bot_user).annotate(
+            node_count=Count('nodes')
+        ).order_by('-created_at')
         projects_data = []
         
         for project in projects:
-            node_count = project.get_nodes().count()
             projects_data.append({
                 'id': project.id,
                 'name': project.name,
                 'description': project.description,
-                'node_count': node_count,
-                'created_at': project.created_at.isoformat(),
-                'updated_at': project.updated_at.isoformat(),
+                'node_count': project.node_count,
+                'created_at': project.created_at,
+                'updated_at': project.updated_at,
             })
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'projects': projects_data,
         })
         
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -492,56 +664,51 @@ def get_projects(request):
 @login_required
 def create_project(request):
     """Create a new project via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
-        
-        # Create the project
-        project = MindmapProject.objects.create(
-            name=data.get('name', 'New Project'),
-            description=data.get('description', ''),
-            creator=bot_user,
-        )
-        
-        # Create a main project node
-        MindmapNode.objects.create(
-            project=project,
-            creator=bot_user,
-            title=project.name,
-            description=project.description or 'Main project node',
-            status='in_progress',
-            priority='high',
-            x_position=400,
-            y_position=300,
-            width=250,
-            height=100,
-            tags=['project', 'main']
-        )
-        
-        return JsonResponse({
+        data = orjson.loads(request.body)
+        
+        # Create the project and its main node in a single transaction
+        with transaction.atomic():
+            project = MindmapProject.objects.create(
+                name=data.get('name', 'New Project'),
+                description=data.get('description', ''),
+                creator=bot_user,
+            )
+            
+            # Create a main project node
+            MindmapNode.objects.create(
+                project=project,
+                creator=bot_user,
+                title=project.name,
+                description=project.description or 'Main project node',
+                status='in_progress',
+                priority='high',
+                x_position=400,
+                y_position=300,
+                width=250,
+                height=100,
+                tags=['project', 'main'],
+                is_main=True,
+            )
+        
+        return fast_json_response({
             'success': True,
             'project': {
                 'id': project.id,
                 'name': project.name,
                 'description': project.description,
                 'node_count': 1,
-                'created_at': project.created_at.isoformat(),
-                'updated_at': project.updated_at.isoformat(),
+                'created_at': project.created_at,
+                'updated_at': project.updated_at,
             }
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -549,62 +716,57 @@ def create_project(request):
 @login_required
 def update_project(request):
     """Update an existing project via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         project_id = data.get('id')
         
         if not project_id:
-            return JsonResponse({'success': False, 'error': 'Project ID required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Project ID required'}, status=400)
         
         project = get_object_or_404(MindmapProject, id=project_id)
         
         # Check if user has permission to edit this project
         if project.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+            return fast_json_response({'success': False, 'error': 'Permission denied'}, status=403)
         
         # Update project fields
+        changed_fields = ['updated_at']
         if 'name' in data:
             project.name = data['name']
+            changed_fields.append('name')
         if 'description' in data:
             project.description = data['description']
+            changed_fields.append('description')
         
-        project.save()
+        project.save(update_fields=changed_fields)
         
         # Update the main project node title if name changed
         if 'name' in data:
-            main_node = MindmapNode.objects.filter(
-                project=project,
-                tags__contains=['project', 'main']
-            ).first()
-            if main_node:
-                main_node.title = project.name
-                main_node.save()
-        
-        return JsonResponse({
+            # update() skips auto_now and save(), so stamp updated_at and invalidate the cache here
+            renamed = MindmapNode.objects.filter(project=project, is_main=True).update(
+                title=project.name, updated_at=timezone.now()
+            )
+            if renamed:
+                bump_project_cache_version(project.id)
+        
+        return fast_json_response({
             'success': True,
             'project': {
                 'id': project.id,
                 'name': project.name,
                 'description': project.description,
                 'node_count': project.get_nodes().count(),
-                'created_at': project.created_at.isoformat(),
-                'updated_at': project.updated_at.isoformat(),
+                'created_at': project.created_at,
+                'updated_at': project.updated_at,
             }
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -612,36 +774,29 @@ def update_project(request):
 @login_required
 def delete_project(request):
     """Delete a project via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         project_id = data.get('id')
         
         if not project_id:
-            return JsonResponse({'success': False, 'error': 'Project ID required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Project ID required'}, status=400)
         
         project = get_object_or_404(MindmapProject, id=project_id)
         
         # Check if user has permission to delete this project
         if project.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+            return fast_json_response({'success': False, 'error': 'Permission denied'}, status=403)
         
         project.delete()
         
-        return JsonResponse({'success': True})
+        return fast_json_response({'success': True})
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -649,86 +804,38 @@ def delete_project(request):
 @login_required
 def switch_project(request):
     """Switch to a different project via AJAX"""
-    try:
-        bot_user = BotUser.objects.get(user=request.user)
-    except BotUser.DoesNotExist:
-        bot_user = BotUser.objects.create(
-            user=request.user,
-            telegram_id=0,
-            first_name=request.user.first_name or 'User',
-            last_name=request.user.last_name or '',
-            username=request.user.username or ''
-        )
+    bot_user = request.bot_user
     
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         project_id = data.get('project_id')
         
         if not project_id:
-            return JsonResponse({'success': False, 'error': 'Project ID required'}, status=400)
+            return fast_json_response({'success': False, 'error': 'Project ID required'}, status=400)
         
         project = get_object_or_404(MindmapProject, id=project_id)
         
         # Check if user has permission to access this project
         if project.creator != bot_user:
-            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+            return fast_json_response({'success': False, 'error': 'Permission denied'}, status=403)
         
-        # Save the selected project ID to session
-        request.session['last_selected_project_id'] = project_id
+        # Save the selected project ID to session, skipping the write when unchanged
+        if request.session.get('last_selected_project_id') != project.id:
+            request.session['last_selected_project_id'] = project.id
         
-        # Get all nodes and connections for the project
-        nodes = MindmapNode.objects.filter(project=project).order_by('-created_at')
-        connections = MindmapConnection.objects.filter(
-            from_node__project=project
-        ).select_related('from_node', 'to_node')
-        
-        nodes_data = []
-        for node in nodes:
-            # Get child node IDs for this node
-            child_connections = connections.filter(from_node=node)
-            children_ids = [str(conn.to_node.id) for conn in child_connections]
-            
-            nodes_data.append({
-                'id': str(node.id),
-                'title': node.title,
-                'description': node.description,
-                'status': node.status,
-                'priority': node.priority,
-                'x': node.x_position,
-                'y': node.y_position,
-                'width': node.width,
-                'height': node.height,
-                'tags': node.tags,
-                'children': children_ids,
-                'assignee': {
-                    'id': str(node.assignee.id),
-                    'name': node.assignee.get_full_name(),
-                    'avatar': 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?ixlib=rb-1.2.1&ixid=eyJhcHBfaWQiOjEyMDd9&auto=format&fit=facearea&facepad=2&w=256&h=256&q=80'
-                } if node.assignee else None,
-            })
-        
-        connections_data = []
-        for connection in connections:
-            connections_data.append({
-                'id': connection.id,
-                'from_node_id': str(connection.from_node.id),
-                'to_node_id': str(connection.to_node.id),
-                'connection_type': connection.connection_type,
-                'label': connection.label,
-                'color': connection.color,
-                'thickness': connection.thickness,
-            })
+        mindmap_data = _get_cached_mindmap_data(project)
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'project': {
                 'id': project.id,
                 'name': project.name,
                 'description': project.description,
             },
-            'nodes': nodes_data,
-            'connections': connections_data,
+            **mindmap_data,
         })
         
+    except orjson.JSONDecodeError:
+        return fast_json_response({'success': False, 'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        return fast_json_response({'success': False, 'error': str(e)}, status=500)
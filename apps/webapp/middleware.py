@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from .models import BotUser, get_bot_user_cache_key
+
+
+def get_or_create_bot_user(user):
+    """Get the BotUser for an authenticated user, creating it if missing"""
+    key = get_bot_user_cache_key(user.id)
+    bot_user = cache.get(key)
+    if bot_user is None:
+        bot_user, _ = BotUser.objects.get_or_create(
+            user=user,
+            defaults={
+                'telegram_id': 0,
+                'first_name': user.first_name or 'User',
+                'last_name': user.last_name or '',
+                'username': user.username or '',
+            }
+        )
+        cache.set(key, bot_user, 300)
+    return bot_user
+
+
+class BotUserMiddleware:
+    """Attach the current user's BotUser to the request as request.bot_user"""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        # Resolved lazily so requests that never use it don't hit the cache or DB
+        request.bot_user = SimpleLazyObject(lambda: get_or_create_bot_user(request.user))
+        return self.get_response(request)
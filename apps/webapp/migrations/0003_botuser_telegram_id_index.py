@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webapp', '0002_alter_botuser_telegram_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='botuser',
+            index=models.Index(fields=['telegram_id'], name='botuser_tg_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:46
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Concat, Trim
+
+
+def fill_full_name(apps, schema_editor):
+    BotUser = apps.get_model('webapp', 'BotUser')
+    BotUser.objects.update(
+        full_name=Trim(Concat('first_name', Value(' '), Coalesce('last_name', Value(''))))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webapp', '0003_botuser_telegram_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='botuser',
+            name='full_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=201),
+        ),
+        migrations.RunPython(fill_full_name, migrations.RunPython.noop),
+    ]
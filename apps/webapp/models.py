@@ -1,8 +1,13 @@
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 
+def get_bot_user_cache_key(user_id):
+    return f'botuser:{user_id}'
+
+
 class BotUser(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='bot_user')
     telegram_id = models.BigIntegerField()
@@ -10,6 +15,7 @@ class BotUser(models.Model):
     username = models.CharField(max_length=100, blank=True, null=True)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100, blank=True, null=True)
+    full_name = models.CharField(max_length=201, blank=True, default='', editable=False)
     language_code = models.CharField(max_length=10, blank=True, null=True)
     register_date = models.DateTimeField(default=timezone.now)
     last_login = models.DateTimeField(auto_now=True)
@@ -17,10 +23,28 @@ class BotUser(models.Model):
     class Meta:
         verbose_name = 'Bot User'
         verbose_name_plural = 'Bot Users'
+        indexes = [
+            models.Index(fields=['telegram_id'], name='botuser_tg_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name or ''} (@{self.username or 'no_username'})"
     
+    def save(self, *args, **kwargs):
+        # Keep the denormalized display name in step with its source fields
+        self.full_name = self.get_full_name()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'first_name', 'last_name'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'full_name'}
+        super().save(*args, **kwargs)
+        cache.delete(get_bot_user_cache_key(self.user_id))
+    
+    def delete(self, *args, **kwargs):
+        user_id = self.user_id
+        result = super().delete(*args, **kwargs)
+        cache.delete(get_bot_user_cache_key(user_id))
+        return result
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name or ''}".strip()
     
@@ -1,3 +1,76 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .middleware import get_or_create_bot_user
+from .models import BotUser
+from .views import create_telegram_user
+
+
+class CreateTelegramUserTests(TestCase):
+    def test_uses_base_username_when_free(self):
+        user, bot_user = create_telegram_user({'id': 7, 'first_name': 'Ann'})
+        self.assertEqual(user.username, 'tg_7')
+        self.assertEqual(bot_user.telegram_id, 7)
+
+    def test_suffixes_username_on_collision(self):
+        User.objects.create_user('tg_7')
+        User.objects.create_user('tg_7_1')
+        user, _ = create_telegram_user({'id': 7, 'first_name': 'Ann'})
+        self.assertEqual(user.username, 'tg_7_2')
+        self.assertEqual(user.email, 'tg_7_2@telegram.local')
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with self.assertRaises(IntegrityError):
+            create_telegram_user({'id': 8, 'first_name': 'Ann', 'last_name': None})
+        self.assertFalse(User.objects.filter(username__startswith='tg_8').exists())
+
+
+class BotUserFullNameTests(TestCase):
+    def setUp(self):
+        self.bot_user = BotUser.objects.create(
+            user=User.objects.create_user('ann'), telegram_id=1, first_name='Ann', last_name='Lee'
+        )
+
+    def test_full_name_set_on_create(self):
+        self.assertEqual(BotUser.objects.get(pk=self.bot_user.pk).full_name, 'Ann Lee')
+
+    def test_full_name_refreshed_on_partial_save(self):
+        self.bot_user.first_name = 'Anna'
+        self.bot_user.save(update_fields=['first_name'])
+        self.assertEqual(BotUser.objects.get(pk=self.bot_user.pk).full_name, 'Anna Lee')
+
+    def test_full_name_without_last_name(self):
+        self.bot_user.last_name = None
+        self.bot_user.save()
+        self.assertEqual(BotUser.objects.get(pk=self.bot_user.pk).full_name, 'Ann')
+
+
+class BotUserMiddlewareTests(TestCase):
+    def setUp(self):
+        # The cache isn't rolled back with the test transaction, and ids are reused
+        cache.clear()
+        self.user = User.objects.create_user('ann', first_name='Ann')
+
+    def test_creates_missing_bot_user(self):
+        bot_user = get_or_create_bot_user(self.user)
+        self.assertEqual(bot_user.user, self.user)
+        self.assertEqual(bot_user.first_name, 'Ann')
+
+    def test_cached_lookup_skips_the_database(self):
+        get_or_create_bot_user(self.user)
+        with self.assertNumQueries(0):
+            get_or_create_bot_user(self.user)
+
+    def test_save_invalidates_cached_bot_user(self):
+        bot_user = get_or_create_bot_user(self.user)
+        bot_user.first_name = 'Anna'
+        bot_user.save()
+        self.assertEqual(get_or_create_bot_user(self.user).first_name, 'Anna')
+
+    def test_request_exposes_bot_user(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('mindmap:mindmap'))
+        self.assertEqual(response.wsgi_request.bot_user.user_id, self.user.id)
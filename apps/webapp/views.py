@@ -2,10 +2,13 @@ from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.contrib.auth import login, logout
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from .models import BotUser
 import json
 
+MAX_USERNAME_ATTEMPTS = 20
+
 def auth_view(request):
     """Authentication page view - handles Telegram user registration/login"""
     
@@ -21,7 +24,7 @@ def auth_view(request):
                     bot_user = BotUser.objects.get(telegram_id=telegram_user['id'])
                     # Update last login
                     bot_user.last_login = timezone.now()
-                    bot_user.save()
+                    bot_user.save(update_fields=['last_login'])
                     
                     # Login the user
                     user = bot_user.user
@@ -55,22 +58,25 @@ def create_telegram_user(telegram_data):
     # Create Django User with unique username
     base_username = f"tg_{telegram_data['id']}"
     username = base_username
-    counter = 1
-    
-    # Keep trying until we find a unique username
-    while User.objects.filter(username=username).exists():
-        username = f"{base_username}_{counter}"
-        counter += 1
-    
-    email = f"{username}@telegram.local"
     
-    user = User.objects.create_user(
-        username=username,
-        email=email,
-        first_name=telegram_data.get('first_name', ''),
-        last_name=telegram_data.get('last_name', ''),
-        password=None  # No password for Telegram users
-    )
+    # Let the unique username index reject collisions instead of checking first;
+    # the savepoint keeps a failed insert from breaking an outer transaction
+    for counter in range(1, MAX_USERNAME_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username,
+                    email=f"{username}@telegram.local",
+                    first_name=telegram_data.get('first_name', ''),
+                    last_name=telegram_data.get('last_name', ''),
+                    password=None  # No password for Telegram users
+                )
+            break
+        except IntegrityError:
+            # Only a taken username is worth retrying; any other constraint failure is real
+            if counter == MAX_USERNAME_ATTEMPTS or not User.objects.filter(username=username).exists():
+                raise
+            username = f"{base_username}_{counter}"
     
     # Create BotUser
     bot_user = BotUser.objects.create(